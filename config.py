@@ -2,8 +2,13 @@
 Configuration management for Todo API
 Handles environment variables and application settings
 """
+import logging
 import os
-from typing import List
+import sys
+from functools import lru_cache
+from typing import Tuple
+from urllib.parse import urlsplit
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -31,32 +36,43 @@ class Settings(BaseSettings):
     rate_limit_per_minute: int = 60
     
     # CORS Settings
-    cors_origins: List[str] = ["http://localhost:3000", "http://localhost:8080", "http://127.0.0.1:8000"]
+    cors_origins: Tuple[str, ...] = ("http://localhost:3000", "http://localhost:8080", "http://127.0.0.1:8000")
     cors_allow_credentials: bool = True
     
+    @field_validator("cors_origins")
+    @classmethod
+    def intern_cors_origins(cls, origins: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Intern origins since they are compared on every CORS request"""
+        return tuple(sys.intern(origin) for origin in origins)
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get application settings (loaded once and cached)"""
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
 
 
-def get_settings() -> Settings:
-    """Get application settings"""
-    return settings
+# Environment name is fixed at startup, so normalize it once
+_ENV_LC = settings.environment.lower()
 
 
 def is_production() -> bool:
     """Check if running in production environment"""
-    return settings.environment.lower() == "production"
+    return _ENV_LC == "production"
 
 
 def is_development() -> bool:
     """Check if running in development environment"""
-    return settings.environment.lower() == "development"
+    return _ENV_LC == "development"
 
 
 # Validation functions
@@ -74,6 +90,15 @@ def validate_secret_key() -> None:
             raise ValueError("Must change default SECRET_KEY in production")
 
 
+def redact_database_url(url: str) -> str:
+    """Return the database URL with any credentials removed, safe for logging"""
+    parts = urlsplit(url)
+    if "@" not in parts.netloc:
+        return url
+    host = parts.netloc.rsplit("@", 1)[1]
+    return parts._replace(netloc=host).geturl()
+
+
 def validate_settings() -> None:
     """Validate all settings for security and correctness"""
     validate_secret_key()
@@ -84,8 +109,9 @@ def validate_settings() -> None:
     if settings.access_token_expire_minutes < 1:
         raise ValueError("ACCESS_TOKEN_EXPIRE_MINUTES must be positive")
     
-    print(f"✅ Configuration loaded for {settings.environment} environment")
+    logger = logging.getLogger("todo_api")
+    logger.info(f"✅ Configuration loaded for {settings.environment} environment")
     if is_development():
-        print(f"🔧 Debug mode: {settings.debug}")
-        print(f"🔑 Secret key length: {len(settings.secret_key)} characters")
-        print(f"🗄️ Database: {settings.database_url}")
\ No newline at end of file
+        logger.info(f"🔧 Debug mode: {settings.debug}")
+        logger.info(f"🔑 Secret key length: {len(settings.secret_key)} characters")
+        logger.info(f"🗄️ Database: {redact_database_url(settings.database_url)}")
\ No newline at end of file
@@ -3,20 +3,29 @@ Error handling and custom exceptions for Todo API
 Provides consistent error responses and proper HTTP status codes
 """
 from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
 from typing import Any, Dict, Optional
 import traceback
-import uuid
+import secrets
+import types
+
+import orjson
 
 from logging_config import log_error, log_security_event
 
 
+# Shared read-only placeholder for exceptions raised without details
+_EMPTY_DETAILS = types.MappingProxyType({})
+
+
 class TodoAPIException(Exception):
     """Base exception for Todo API"""
     
+    __slots__ = ('message', 'status_code', 'error_code', 'details')
+    
     def __init__(
         self,
         message: str,
@@ -27,7 +36,7 @@ class TodoAPIException(Exception):
         self.message = message
         self.status_code = status_code
         self.error_code = error_code
-        self.details = details or {}
+        self.details = details if details else _EMPTY_DETAILS
         super().__init__(self.message)
 
 
@@ -59,15 +68,14 @@ class ValidationError(TodoAPIException):
     """Input validation errors (custom business logic validation)"""
     
     def __init__(self, message: str, field: str = None, details: Optional[Dict[str, Any]] = None):
-        error_details = details or {}
         if field:
-            error_details["field"] = field
+            details = {**details, "field": field} if details else {"field": field}
             
         super().__init__(
             message=message,
             status_code=status.HTTP_400_BAD_REQUEST,
             error_code="VALIDATION_ERROR",
-            details=error_details
+            details=details
         )
 
 
@@ -79,7 +87,7 @@ class SchemaValidationError(TodoAPIException):
             message=message,
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             error_code="SCHEMA_VALIDATION_ERROR",
-            details=details or {}
+            details=details
         )
 
 
@@ -91,8 +99,7 @@ class NotFoundError(TodoAPIException):
         if resource_id:
             message += f" with ID: {resource_id}"
             
-        error_details = details or {}
-        error_details["resource"] = resource
+        error_details = {**details, "resource": resource} if details else {"resource": resource}
         if resource_id:
             error_details["resource_id"] = resource_id
             
@@ -108,15 +115,14 @@ class ConflictError(TodoAPIException):
     """Resource conflict errors"""
     
     def __init__(self, message: str, resource: str = None, details: Optional[Dict[str, Any]] = None):
-        error_details = details or {}
         if resource:
-            error_details["resource"] = resource
+            details = {**details, "resource": resource} if details else {"resource": resource}
             
         super().__init__(
             message=message,
             status_code=status.HTTP_409_CONFLICT,
             error_code="RESOURCE_CONFLICT",
-            details=error_details
+            details=details
         )
 
 
@@ -124,9 +130,7 @@ class RateLimitError(TodoAPIException):
     """Rate limiting errors"""
     
     def __init__(self, message: str = "Rate limit exceeded", retry_after: int = None):
-        details = {}
-        if retry_after:
-            details["retry_after"] = retry_after
+        details = {"retry_after": retry_after} if retry_after else None
             
         super().__init__(
             message=message,
@@ -148,15 +152,66 @@ class DatabaseError(TodoAPIException):
         )
 
 
+class _LazyStr:
+    """Defer str() of a value until a log formatter actually renders it"""
+    
+    __slots__ = ('value',)
+    
+    def __init__(self, value: Any):
+        self.value = value
+    
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+def _log_server_error(error: TodoAPIException, context: Dict[str, Any]) -> None:
+    log_error(error, context, request_id=context["request_id"])
+
+
+def _log_security_error(error: TodoAPIException, context: Dict[str, Any]) -> None:
+    log_security_event(
+        event_type=error.error_code,
+        details=context,
+        severity="WARNING"
+    )
+
+
+def _log_client_error(error: TodoAPIException, context: Dict[str, Any]) -> None:
+    logging.getLogger("todo_api").warning(
+        f"Client error: {error.message}",
+        extra=context
+    )
+
+
+# Client error status codes that are logged as security events
+_SEVERITY_BY_STATUS = {
+    status.HTTP_401_UNAUTHORIZED: "security",
+    status.HTTP_403_FORBIDDEN: "security",
+}
+
+# Level each severity is logged at
+_SEVERITY_LEVELS = {
+    "error": logging.ERROR,
+    "security": logging.WARNING,
+    "warning": logging.WARNING,
+}
+
+_ERROR_LOGGERS = {
+    "error": _log_server_error,
+    "security": _log_security_error,
+    "warning": _log_client_error,
+}
+
+
 def create_error_response(
     error: TodoAPIException,
     request: Request = None,
     include_details: bool = True
-) -> JSONResponse:
+) -> Response:
     """Create standardized error response"""
     
     # Generate request ID for tracking
-    request_id = str(uuid.uuid4())
+    request_id = secrets.token_hex(12)
     
     # Basic error response
     # Use FastAPI compatible format for client compatibility
@@ -169,64 +224,62 @@ def create_error_response(
         }
     }
     
-    # Add details in development or for client errors (4xx)
-    if include_details and (error.status_code < 500 or include_details):
-        if error.details:
-            error_response["error"]["details"] = error.details
-    
-    # Log error with context
-    context = {
-        "error_code": error.error_code,
-        "status_code": error.status_code,
-        "request_id": request_id
-    }
-    
-    if request:
-        context.update({
-            "method": request.method,
-            "url": str(request.url),
-            "user_agent": request.headers.get("user-agent"),
-            "client_ip": request.client.host if request.client else None
-        })
+    # Add details when requested and present
+    if include_details and error.details:
+        error_response["error"]["details"] = error.details
     
     # Log based on severity
     if error.status_code >= 500:
-        log_error(error, context, request_id=request_id)
-    elif error.status_code == 401 or error.status_code == 403:
-        log_security_event(
-            event_type=error.error_code,
-            details=context,
-            severity="WARNING"
-        )
+        severity = "error"
     else:
-        logging.getLogger("todo_api").warning(
-            f"Client error: {error.message}",
-            extra=context
-        )
+        severity = _SEVERITY_BY_STATUS.get(error.status_code, "warning")
     
-    return JSONResponse(
+    # Log error with context (skip building it when that level is silenced)
+    if logging.getLogger("todo_api").isEnabledFor(_SEVERITY_LEVELS[severity]):
+        context = {
+            "error_code": error.error_code,
+            "status_code": error.status_code,
+            "request_id": request_id
+        }
+        
+        if request:
+            context.update({
+                "method": request.method,
+                "url": _LazyStr(request.url),
+                "user_agent": request.headers.get("user-agent"),
+                "client_ip": request.client.host if request.client else None
+            })
+        
+        _ERROR_LOGGERS[severity](error, context)
+    
+    return Response(
+        content=orjson.dumps(error_response, option=orjson.OPT_NON_STR_KEYS),
         status_code=error.status_code,
-        content=error_response
+        media_type="application/json"
     )
 
 
-async def todo_api_exception_handler(request: Request, exc: TodoAPIException) -> JSONResponse:
+async def todo_api_exception_handler(request: Request, exc: TodoAPIException) -> Response:
     """Handle TodoAPI custom exceptions"""
     return create_error_response(exc, request)
 
 
-async def http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
+# Status codes with a dedicated TodoAPI exception type
+_HTTP_EXCEPTION_MAP = {
+    status.HTTP_401_UNAUTHORIZED: AuthenticationError,
+    status.HTTP_403_FORBIDDEN: AuthorizationError,
+    status.HTTP_404_NOT_FOUND: lambda detail: NotFoundError("Resource", details={"original_detail": detail}),
+    status.HTTP_409_CONFLICT: ConflictError,
+}
+
+
+async def http_exception_handler(request: Request, exc: HTTPException) -> Response:
     """Handle FastAPI HTTP exceptions"""
     
     # Convert to TodoAPI exception
-    if exc.status_code == 401:
-        todo_exc = AuthenticationError(exc.detail)
-    elif exc.status_code == 403:
-        todo_exc = AuthorizationError(exc.detail)
-    elif exc.status_code == 404:
-        todo_exc = NotFoundError("Resource", details={"original_detail": exc.detail})
-    elif exc.status_code == 409:
-        todo_exc = ConflictError(exc.detail)
+    convert = _HTTP_EXCEPTION_MAP.get(exc.status_code)
+    if convert is not None:
+        todo_exc = convert(exc.detail)
     elif 400 <= exc.status_code < 500:
         todo_exc = ValidationError(exc.detail)
     else:
@@ -240,18 +293,18 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     return create_error_response(todo_exc, request)
 
 
-async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> Response:
     """Handle Pydantic validation errors"""
     
     # Extract validation details
-    validation_errors = []
-    for error in exc.errors():
-        field_path = " -> ".join([str(loc) for loc in error["loc"]])
-        validation_errors.append({
-            "field": field_path,
+    validation_errors = [
+        {
+            "field": " -> ".join(map(str, error["loc"])),
             "message": error["msg"],
             "type": error["type"]
-        })
+        }
+        for error in exc.errors()
+    ]
     
     todo_exc = SchemaValidationError(
         message="Request validation failed",
@@ -264,36 +317,44 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     return create_error_response(todo_exc, request)
 
 
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+# Pre-serialized generic 500 body; only the request ID varies between errors.
+# The request ID is generated internally and never needs JSON escaping.
+_ERR500_PREFIX = orjson.dumps({
+    "error": {
+        "code": "INTERNAL_ERROR",
+        "message": "An unexpected error occurred. Please try again later.",
+        "request_id": ""
+    }
+})[:-3]
+_ERR500_SUFFIX = b'"}}'
+
+
+async def general_exception_handler(request: Request, exc: Exception) -> Response:
     """Handle unexpected exceptions"""
     
     # Generate request ID for tracking
-    request_id = str(uuid.uuid4())
+    request_id = secrets.token_hex(12)
     
     # Log the full exception
-    context = {
-        "request_id": request_id,
-        "method": request.method,
-        "url": str(request.url),
-        "exception_type": type(exc).__name__,
-        "user_agent": request.headers.get("user-agent"),
-        "client_ip": request.client.host if request.client else None
-    }
-    
-    log_error(exc, context, request_id=request_id)
+    if logging.getLogger("todo_api").isEnabledFor(logging.ERROR):
+        context = {
+            "request_id": request_id,
+            "method": request.method,
+            "url": _LazyStr(request.url),
+            "exception_type": type(exc).__name__,
+            "user_agent": request.headers.get("user-agent"),
+            "client_ip": request.client.host if request.client else None
+        }
+        
+        log_error(exc, context, request_id=request_id)
     
     # Create generic error response (don't expose internal details)
-    error_response = {
-        "error": {
-            "code": "INTERNAL_ERROR",
-            "message": "An unexpected error occurred. Please try again later.",
-            "request_id": request_id
-        }
-    }
+    body = _ERR500_PREFIX + request_id.encode() + _ERR500_SUFFIX
     
-    return JSONResponse(
+    return Response(
+        content=body,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=error_response
+        media_type="application/json"
     )
 
 
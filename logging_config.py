@@ -2,50 +2,81 @@
 Logging configuration for Todo API
 Provides structured logging with different levels and formatters
 """
+import atexit
+import copy
 import logging
 import logging.handlers
+import queue
 import sys
 from pathlib import Path
-from typing import Any, Dict
-import json
-from datetime import datetime
+from typing import Any, Dict, List
+from datetime import datetime, timezone
+
+import orjson
 
 from config import settings
 
 
+# Render UTC timestamps as ISO 8601 with a trailing "Z"
+_JSON_OPTIONS = orjson.OPT_UTC_Z
+
+# Fields passed via ``extra=`` that are copied into JSON log entries
+_EXTRA_KEYS = ('user_id', 'request_id', 'endpoint', 'method', 'status_code', 'response_time')
+
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
     
-    def format(self, record: logging.LogRecord) -> str:
+    def render(self, record: logging.LogRecord, fields: Dict[str, Any]) -> str:
+        """Serialize the common record fields followed by ``fields``"""
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
+            **fields,
+        }
+        return orjson.dumps(log_entry, default=str, option=_JSON_OPTIONS).decode()
+    
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {
             "module": record.module,
             "function": record.funcName,
             "line": record.lineno,
         }
         
         # Add extra fields if present
-        if hasattr(record, 'user_id'):
-            log_entry['user_id'] = record.user_id
-        if hasattr(record, 'request_id'):
-            log_entry['request_id'] = record.request_id
-        if hasattr(record, 'endpoint'):
-            log_entry['endpoint'] = record.endpoint
-        if hasattr(record, 'method'):
-            log_entry['method'] = record.method
-        if hasattr(record, 'status_code'):
-            log_entry['status_code'] = record.status_code
-        if hasattr(record, 'response_time'):
-            log_entry['response_time'] = record.response_time
+        record_dict = record.__dict__
+        for key in _EXTRA_KEYS:
+            if key in record_dict:
+                fields[key] = record_dict[key]
             
         # Add exception info if present
         if record.exc_info:
-            log_entry['exception'] = self.formatException(record.exc_info)
+            fields['exception'] = self.formatException(record.exc_info)
+            
+        return self.render(record, fields)
+
+
+class AccessJSONFormatter(JSONFormatter):
+    """JSON formatter specialized for access log records written by log_request"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        record_dict = record.__dict__
+        fields = {
+            "method": record_dict.get('method'),
+            "endpoint": record_dict.get('endpoint'),
+            "status_code": record_dict.get('status_code'),
+            "response_time": record_dict.get('response_time'),
+        }
+        
+        # Optional fields only set for some requests
+        if 'user_id' in record_dict:
+            fields['user_id'] = record_dict['user_id']
+        if 'request_id' in record_dict:
+            fields['request_id'] = record_dict['request_id']
             
-        return json.dumps(log_entry)
+        return self.render(record, fields)
 
 
 class ColoredFormatter(logging.Formatter):
@@ -60,10 +91,61 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._colored_levels = {
+            level: f"{color}{level}{self.RESET}" for level, color in self.COLORS.items()
+        }
+    
     def format(self, record: logging.LogRecord) -> str:
-        color = self.COLORS.get(record.levelname, self.RESET)
-        record.levelname = f"{color}{record.levelname}{self.RESET}"
-        return super().format(record)
+        # Color the level name only while this handler formats; other
+        # handlers formatting the same record must see the plain name
+        levelname = record.levelname
+        record.levelname = self._colored_levels.get(levelname, levelname)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler for an in-process listener
+    
+    Unlike the stdlib version, records keep their exc_info so the JSON
+    formatter on the listener side can still emit the exception field.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+# Background listeners writing queued records to the log files
+_queue_listeners: List[logging.handlers.QueueListener] = []
+
+
+def _stop_queue_listeners() -> None:
+    """Flush and stop the file logging listeners and close their handlers"""
+    while _queue_listeners:
+        listener = _queue_listeners.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(_stop_queue_listeners)
+
+
+def _add_queued_handlers(logger: logging.Logger, *handlers: logging.Handler) -> None:
+    """Attach file handlers to a logger through a queue drained on a background thread"""
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _queue_listeners.append(listener)
+    logger.addHandler(LocalQueueHandler(log_queue))
 
 
 def setup_logging() -> logging.Logger:
@@ -77,8 +159,16 @@ def setup_logging() -> logging.Logger:
     logger = logging.getLogger("todo_api")
     logger.setLevel(logging.DEBUG if settings.debug else logging.INFO)
     
-    # Clear existing handlers
+    access_logger = logging.getLogger("access")
+    
+    # Detach existing handlers before stopping listeners from a previous
+    # setup, so no record is queued for a listener that is gone
     logger.handlers.clear()
+    access_logger.handlers.clear()
+    _stop_queue_listeners()
+    
+    # One JSON formatter shared by the structured application handlers
+    json_formatter = JSONFormatter()
     
     # Console handler with colored output
     console_handler = logging.StreamHandler(sys.stdout)
@@ -92,44 +182,50 @@ def setup_logging() -> logging.Logger:
         )
     else:
         # Production: JSON format
-        console_formatter = JSONFormatter()
+        console_formatter = json_formatter
     
     console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
     
+    # The rotating file handlers below are only driven by queue listener
+    # threads, so size checks and rollovers never stall a request
+    
     # File handler for all logs
     file_handler = logging.handlers.RotatingFileHandler(
         logs_dir / "todo_api.log",
         maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True  # Open the file on first write
     )
     file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(JSONFormatter())
-    logger.addHandler(file_handler)
+    file_handler.setFormatter(json_formatter)
     
     # Error file handler
     error_handler = logging.handlers.RotatingFileHandler(
         logs_dir / "todo_api_errors.log",
         maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True  # Open the file on first write
     )
     error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(JSONFormatter())
-    logger.addHandler(error_handler)
+    error_handler.setFormatter(json_formatter)
+    
+    # File writes happen on a listener thread, off the request path
+    _add_queued_handlers(logger, file_handler, error_handler)
     
     # Access log handler
     access_handler = logging.handlers.RotatingFileHandler(
         logs_dir / "todo_api_access.log",
         maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True  # Open the file on first write
     )
     access_handler.setLevel(logging.INFO)
-    access_handler.setFormatter(JSONFormatter())
+    access_handler.setFormatter(AccessJSONFormatter())
     
-    # Create access logger
-    access_logger = logging.getLogger("access")
+    # Configure access logger
     access_logger.setLevel(logging.INFO)
-    access_logger.addHandler(access_handler)
+    _add_queued_handlers(access_logger, access_handler)
     
     return logger
 
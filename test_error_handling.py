@@ -0,0 +1,112 @@
+"""
+Tests for error handling and standardized error responses
+"""
+import json
+import logging
+import re
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import error_handling
+from error_handling import (
+    AuthenticationError, ConflictError, DatabaseError, NotFoundError, ValidationError,
+    create_error_response, general_exception_handler, http_exception_handler
+)
+
+
+def make_request() -> Request:
+    """Build a minimal HTTP request for calling handlers directly"""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "path": "/test",
+        "query_string": b"",
+        "headers": [(b"user-agent", b"pytest")],
+        "client": ("127.0.0.1", 12345),
+    })
+
+
+class TestHTTPExceptionHandler:
+    """Test conversion of HTTP exceptions into error responses"""
+    
+    @pytest.mark.asyncio
+    async def test_non_string_detail_keys(self):
+        """Test that details with non-string keys are still serialized"""
+        response = await http_exception_handler(make_request(), HTTPException(400, detail={1: "x"}))
+        assert response.status_code == 400
+        
+        data = json.loads(response.body)
+        assert data["detail"] == {"1": "x"}
+        assert data["error"]["code"] == "VALIDATION_ERROR"
+
+
+class TestGeneralExceptionHandler:
+    """Test the generic 500 response for unexpected exceptions"""
+    
+    @pytest.mark.asyncio
+    async def test_generic_500_body(self):
+        """Test that the pre-serialized 500 body is valid JSON with a request ID"""
+        response = await general_exception_handler(make_request(), RuntimeError("boom"))
+        assert response.status_code == 500
+        assert response.media_type == "application/json"
+        
+        data = json.loads(response.body)
+        request_id = data["error"].pop("request_id")
+        assert re.fullmatch(r"[0-9a-f]{24}", request_id)
+        assert data == {
+            "error": {
+                "code": "INTERNAL_ERROR",
+                "message": "An unexpected error occurred. Please try again later."
+            }
+        }
+
+
+class TestErrorLogging:
+    """Test that error logging respects the logger level"""
+    
+    def test_server_errors_logged_when_warnings_silenced(self):
+        """Test that 5xx errors are still logged with the logger at ERROR level"""
+        loggers = {severity: MagicMock() for severity in error_handling._ERROR_LOGGERS}
+        logger = logging.getLogger("todo_api")
+        original_level = logger.level
+        logger.setLevel(logging.ERROR)
+        try:
+            with patch.dict(error_handling._ERROR_LOGGERS, loggers):
+                response = create_error_response(DatabaseError("db down"), make_request())
+                assert response.status_code == 500
+                loggers["error"].assert_called_once()
+                
+                response = create_error_response(ValidationError("bad input"), make_request())
+                assert response.status_code == 400
+                loggers["warning"].assert_not_called()
+        finally:
+            logger.setLevel(original_level)
+
+
+class TestExceptionDetails:
+    """Test how exceptions build their details"""
+    
+    def test_caller_details_not_mutated(self):
+        """Test that subclasses copy caller-supplied details instead of mutating them"""
+        for make_error in (
+            lambda details: NotFoundError("Todo", "123", details=details),
+            lambda details: ValidationError("bad input", field="title", details=details),
+            lambda details: ConflictError("exists", resource="User", details=details),
+        ):
+            details = {"original": 1}
+            error = make_error(details)
+            assert details == {"original": 1}
+            assert error.details["original"] == 1
+    
+    def test_empty_details_omitted_from_response(self):
+        """Test that an exception without details leaves them out of the response"""
+        error = AuthenticationError()
+        assert not error.details
+        
+        data = json.loads(create_error_response(error, make_request()).body)
+        assert "details" not in data["error"]
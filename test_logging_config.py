@@ -0,0 +1,68 @@
+"""
+Tests for logging formatters
+"""
+import json
+import logging
+
+import logging_config
+from logging_config import (
+    AccessJSONFormatter, ColoredFormatter, JSONFormatter, log_error, setup_logging
+)
+
+
+class TestFormatters:
+    """Test console and JSON log formatters"""
+    
+    def test_colored_formatter_does_not_leak_into_json(self):
+        """Test that coloring a record leaves its level name plain for other handlers"""
+        record = logging.LogRecord("todo_api", logging.INFO, __file__, 1, "hello", None, None)
+        
+        colored = ColoredFormatter(fmt="%(levelname)s - %(message)s").format(record)
+        assert "\033[" in colored
+        
+        data = json.loads(JSONFormatter().format(record))
+        assert data["level"] == "INFO"
+
+    
+    def test_access_formatter_keys(self):
+        """Test that access log entries contain exactly the request fields"""
+        record = logging.LogRecord("access", logging.INFO, __file__, 1, "GET /todos - 200 - 0.012s", None, None)
+        record.__dict__.update({
+            "method": "GET",
+            "endpoint": "/todos",
+            "status_code": 200,
+            "response_time": 0.012,
+            "request_id": "abc123",
+        })
+        
+        data = json.loads(AccessJSONFormatter().format(record))
+        assert list(data) == [
+            "timestamp", "level", "logger", "message",
+            "method", "endpoint", "status_code", "response_time", "request_id",
+        ]
+        assert data["timestamp"].endswith("Z")
+        assert data["status_code"] == 200
+        assert data["request_id"] == "abc123"
+
+
+class TestQueuedFileLogging:
+    """Test file logging through the background queue listeners"""
+    
+    def test_exception_reaches_error_log(self, tmp_path, monkeypatch):
+        """Test that exception info survives the queue into the JSON error log"""
+        monkeypatch.chdir(tmp_path)
+        setup_logging()
+        try:
+            try:
+                raise RuntimeError("boom")
+            except RuntimeError as exc:
+                log_error(exc, request_id="test-request")
+        finally:
+            logging_config._stop_queue_listeners()
+            logging.getLogger("todo_api").handlers.clear()
+            logging.getLogger("access").handlers.clear()
+        
+        lines = (tmp_path / "logs" / "todo_api_errors.log").read_text().splitlines()
+        entry = json.loads(lines[-1])
+        assert entry["request_id"] == "test-request"
+        assert "RuntimeError: boom" in entry["exception"]